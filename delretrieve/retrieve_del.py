@@ -18,6 +18,7 @@ import os
 from .support import usr_dir, specifyDataDir, validYears, writeLog, InputError
 
 obs_dir, profiles_dir, table_dir, rawprofiles_dir = specifyDataDir()
+summary_dir = os.path.join(profiles_dir, 'summary')
 
 
 def getObs(tablename = None, querystring = 'SELECT * FROM tablename', chunksize = 10000):
@@ -211,8 +212,8 @@ def getProfiles(group_year, month, unit):
     return df
     
 
-def writeProfilePath(group_year, year, month, unit, filetype):
-    """Creates the directory hierarchy and file names for writing raw profiles. 
+def writeProfilePath(group_year, year, month, unit, filetype, profile_dir=rawprofiles_dir):
+    """Creates the directory hierarchy and file names for writing profiles. 
     
     Files are named as follows:
         observationYear-observationMonth_GgroupYear_unit.filetype
@@ -225,6 +226,7 @@ def writeProfilePath(group_year, year, month, unit, filetype):
         month (int): 1 <= month <= 12
         unit (str): 'A', 'V', 'kVA', 'Hz', 'kW'
         filetype (str): 'csv', 'feather'
+        profile_dir (str): Defaults to the raw profiles directory.
     
     Returns:
         os.path: path_name_for_profile_file.filetype.
@@ -235,8 +237,11 @@ def writeProfilePath(group_year, year, month, unit, filetype):
             |---raw
                 |---unit
                     |---year    
+            |---summary
+                |---unit
+                    |---year    
     """
-    dir_path = os.path.join(rawprofiles_dir, str(unit), str(year))
+    dir_path = os.path.join(profile_dir, str(unit), str(year))
     try:
         # Create profile directory if it does not exist
         os.makedirs(dir_path , exist_ok=True) 
@@ -250,10 +255,66 @@ def writeProfilePath(group_year, year, month, unit, filetype):
     return file_path
 
 
+def yearSlices(datefield):
+    """Finds the row boundaries of each observation year in a sorted Datefield.
+    
+    Profiles are queried in Datefield order, so each year occupies one contiguous 
+    block of rows. Year boundaries are located with a binary search on the datetime 
+    array instead of building a boolean mask for every year.
+    
+    Parameters:
+        datefield (pandas series): Datetime values sorted in ascending order.
+    
+    Returns:
+        list (int, int, int): Year, start row and end row of each non-empty year.
+    """
+    dates = datefield.values
+    first = dates[0].astype('datetime64[Y]').astype(int) + 1970
+    last = dates[-1].astype('datetime64[Y]').astype(int) + 1970
+    years = np.arange(first, last + 2)
+    bounds = dates.searchsorted((years - 1970).astype('datetime64[Y]').astype(dates.dtype))
+    
+    return [(int(y), int(start), int(end)) for y, start, end in zip(years[:-1], bounds[:-1], 
+            bounds[1:]) if end > start]
+
+
+def profileSummary(df, year, month):
+    """Computes data quality statistics per ProfileID for one month of profiles.
+    
+    Parameters:
+        df (pandas dataframe): Profiles for a single observation year and month.
+        year (int): Observation year
+        month (int): 1 <= month <= 12
+    
+    Returns:
+        pandas dataframe: Reading count, valid ratio, first and last Datefield, 
+            missing 5 minute slots and Unitsread range and mean by ProfileID.
+    """
+    valid = df.Valid.astype(str).str.strip().isin(['Y','1','True'])
+    summary = df.groupby('ProfileID', observed=True).agg(
+            Count = ('Datefield', 'size'),
+            DateMin = ('Datefield', 'min'),
+            DateMax = ('Datefield', 'max'),
+            Slots = ('Datefield', 'nunique'),
+            UnitsMin = ('Unitsread', 'min'),
+            UnitsMax = ('Unitsread', 'max'),
+            UnitsMean = ('Unitsread', 'mean'))
+    summary.insert(1, 'ValidRatio', valid.groupby(df.ProfileID, observed=True).mean())
+    # 288 5 minute slots per day in the calendar month
+    month_slots = pd.Period(year=year, month=month, freq='M').days_in_month * 288
+    summary['MissingSlots'] = month_slots - summary.pop('Slots')
+    summary.insert(0, 'Month', month)
+    summary.insert(0, 'Year', year)
+    
+    return summary.reset_index()
+
+
 def writeProfiles(group_year, month, unit, filetype):
     """Retrieves and saves profiles by group_year, month and units.
     
-    The retrieval is done incrementally to manage the large dataset.
+    The retrieval is done incrementally to manage the large dataset. A data 
+    quality summary for each ProfileID is computed from the same data and 
+    saved to the summary directory alongside the profiles.
     
     Parameters:
         group_year (int): 1994 <= year <= 2014
@@ -262,24 +323,31 @@ def writeProfiles(group_year, month, unit, filetype):
         filetype (str): 'csv', 'feather'
     
     Returns:
-        File saved to disk.
+        Files saved to disk.
     """
     df = getProfiles(group_year, month, unit)
-    try:
-        yrs = df.Datefield.dt.year.unique()
-    except:
+    if df.empty:
         expr = '-'.join(['G'+str(group_year), str(month), unit])
         raise InputError(expr, 'no data collected.')
+    if not df.Datefield.is_monotonic_increasing:
+        df = df.sort_values('Datefield', kind='mergesort')
         
-    for y in yrs:
+    for y, start, end in yearSlices(df.Datefield):
         path = writeProfilePath(group_year, y, month, unit, filetype)
-        filtered_df = df[df.Datefield.dt.year == y].reset_index(drop=True)
+        summary_path = writeProfilePath(group_year, y, month, unit, filetype, 
+                                        summary_dir)
+        # Positional slice shares data with df; only the index is replaced
+        filtered_df = df.iloc[start:end]
+        filtered_df.index = pd.RangeIndex(end - start)
+        summary = profileSummary(filtered_df, y, month)
         
         try:
             if filetype=='feather':
                 feather.write_dataframe(filtered_df, path)
+                feather.write_dataframe(summary, summary_path)
             elif filetype=='csv':
                 filtered_df.to_csv(path, index=False)
+                summary.to_csv(summary_path, index=False)
             print(y, ': Write success')
         except Exception as e:
             print(y, ': Write FAIL')